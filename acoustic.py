@@ -7,6 +7,7 @@ import pyroomacoustics as pra
 import numpy as np
 from scipy.io import wavfile
 from scipy import signal
+import hashlib
 import os
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
@@ -17,11 +18,26 @@ SIZE_REDUCTION_FACTOR = 700.0  # to get a realistic room size (not 3km)
 # Configurable sound source file - change this to use different audio for simulation
 SOUND_SOURCE_FILE = 'sounds/sources/test_sound.wav'
 
+# Number of room impulse responses kept between simulate() calls
+RIR_CACHE_SIZE = 8
+
 class Acoustic(pra.room.Room):
 
     def __init__(self):
         self.sample_rate = 44100
         self.speed_of_sound = 343.0
+        # Maps _rir_cache_key(...) -> list of per-microphone RIRs
+        self._rir_cache = {}
+
+    def __getstate__(self):
+        """
+        Drop the RIR cache when pickling (e.g. when handing an Acoustic to a
+        worker process). It can hold several seconds of audio per microphone
+        and is rebuilt on demand by simulate().
+        """
+        state = self.__dict__.copy()
+        state['_rir_cache'] = {}
+        return state
     
     def generate_spectrogram_comparison(self, original_file, output_file, sample_rate, output_dir):
         """
@@ -93,6 +109,133 @@ class Acoustic(pra.room.Room):
         
         return spectrogram_file
 
+    @staticmethod
+    def _rir_cache_key(triangles, source_pos, mic_array, fs):
+        """
+        Build the RIR cache key for a simulation.
+        Material and max_order are fixed in this class, so the RIR is fully
+        determined by the scaled geometry, source/mic positions and sample rate.
+        """
+        geometry_hash = hashlib.sha1(np.ascontiguousarray(triangles).tobytes()).hexdigest()
+        return (geometry_hash, tuple(np.ravel(source_pos)), tuple(np.ravel(mic_array)), fs)
+
+    @staticmethod
+    def _make_walls_batch(triangles, material):
+        """
+        Create one pyroomacoustics wall per triangle.
+        
+        Args:
+            triangles: Array of shape (n, 3, 3) holding scaled triangle vertices
+            material: pra.Material applied to every wall
+            
+        Returns:
+            list: pra walls, in the same order as triangles
+        """
+        # Look the coefficients up once rather than once per wall
+        absorption = material.energy_absorption["coeffs"]
+        scattering = material.scattering["coeffs"]
+        # pra.wall_factory expects vertices in shape (3, N)
+        return [pra.wall_factory(triangle.T, absorption, scattering) for triangle in triangles]
+
+    def _compute_rirs(self, triangles, material, fs, source_pos, source_signal, mic_array):
+        """
+        Build the pyroomacoustics room from the scaled triangles and compute its RIRs.
+        
+        Returns:
+            list: One float32 room impulse response (1D array) per microphone
+            
+        Raises:
+            ValueError: If the room geometry is invalid
+            RuntimeError: If pyroomacoustics fails for any other reason
+        """
+        walls = self._make_walls_batch(triangles, material)
+        
+        print(f'Created {len(walls)} walls from {len(triangles)} triangles')
+        
+        if len(walls) == 0:
+            raise ValueError("No valid walls created from the 3D model")
+
+        room = (
+            pra.Room(
+                walls,
+                fs=fs,
+                max_order=3,
+                air_absorption=True,
+            )
+            .add_source(source_pos, signal=source_signal)
+            .add_microphone_array(mic_array)
+        )
+        
+        # Enable ray tracing once with the number of rays set manually to
+        # avoid calculation errors. Passing ray_tracing=True to the
+        # constructor would first configure it with defaults derived from
+        # the room volume, only for those to be overwritten here.
+        room.set_ray_tracing(n_rays=1000)
+
+        print('Room volume: ', room.volume)
+        
+        # Validate room was created successfully
+        if room.volume <= 0:
+            raise ValueError("Invalid room geometry: room volume is zero or negative")
+        
+        # Check if volume is suspiciously small (less than 1 cubic unit after scaling)
+        if room.volume < 1e-3:
+            print(f"WARNING: Room volume is very small ({room.volume:.2e} cubic units)")
+            print("This may indicate an open mesh (e.g., pyramid without bottom face)")
+            print("PyRoomAcoustics requires closed meshes for proper simulation")
+
+        try:
+            # compute the rir
+            print('Image source model')
+            room.image_source_model()
+            
+            print('Ray tracing')
+            room.ray_tracing()
+            
+            print('Compute RIR')
+            room.compute_rir()
+            
+            print('Plotting RIR')
+            room.plot_rir()
+        except (ValueError, IndexError, ZeroDivisionError) as e:
+            # These errors often indicate geometry problems
+            raise ValueError(
+                f"Room geometry is invalid for acoustic simulation: {str(e)}\n"
+                f"Possible causes:\n"
+                f"  - Mesh is not closed (has holes or open faces)\n"
+                f"  - Mesh is too small or too complex\n"
+                f"  - Try using a closed mesh like a box or room with all faces"
+            ) from e
+        except Exception as e:
+            raise RuntimeError(f"PyRoomAcoustics simulation failed: {str(e)}") from e
+
+        # pyroomacoustics returns float64 RIRs; float32 is ample for 16-bit
+        # output and halves the size of every cached response
+        return [np.asarray(room.rir[m][0], dtype=np.float32) for m in range(mic_array.shape[1])]
+
+    @staticmethod
+    def _convolve_rirs(source_signal, rirs):
+        """
+        Convolve a mono source signal with one RIR per microphone, with the
+        shorter RIRs zero-padded to the longest one. This stands in for
+        pra.Room.simulate with a single source and no noise, but is not
+        bit-identical to it: the output is exactly
+        len(source_signal) + rir_length - 1 samples, without pra's padding
+        to an even length, and float32 rounding can move samples by about
+        1 LSB once converted to int16.
+        """
+        rir_length = max(len(rir) for rir in rirs)
+
+        rir_matrix = np.zeros((len(rirs), rir_length), dtype=np.float32)
+        for m, rir in enumerate(rirs):
+            rir_matrix[m, :len(rir)] = rir
+
+        # Convolve all microphones in one batched call. Overlap-add splits
+        # the long source signal into blocks sized to the RIR, so the FFTs
+        # stay small instead of spanning signal + RIR length; scipy falls
+        # back to a single FFT when the two lengths are comparable.
+        return signal.oaconvolve(source_signal[np.newaxis, :], rir_matrix, axes=1)
+
     def simulate(self, walls_from_render, room_center, model_vertices, scale_factor=None, sound_source_file=None):
         """
         Simulate acoustics in the given room geometry.
@@ -137,35 +280,31 @@ class Acoustic(pra.room.Room):
         
         material = pra.Material(energy_absorption=0.2, scattering=0.1)
 
-        # create one wall per triangle from the renderer's grouped walls
-        walls = []
-        triangles_processed = 0
-        for wall_info in walls_from_render:
-            for tri_idx in wall_info['triangles']:
-                # Get the vertices for this triangle
-                triangle_verts = model_vertices[tri_idx*3 : tri_idx*3+3]
+        # Gather every triangle referenced by the renderer's grouped walls in
+        # a single indexing pass over a (n_triangles, 3, 3) view of the
+        # vertex array, instead of slicing model_vertices once per triangle
+        tri_indices = np.fromiter(
+            (tri_idx for wall_info in walls_from_render for tri_idx in wall_info['triangles']),
+            dtype=np.intp,
+        )
+        n_model_triangles = len(model_vertices) // 3
+        valid = tri_indices < n_model_triangles
+        for tri_idx in tri_indices[~valid]:
+            print(f"  Warning: Skipping triangle {tri_idx} - insufficient vertices")
 
-                # pra.wall_factory expects vertices in shape (3, N)
-                # and they should be scaled down.
-                if triangle_verts.shape[0] < 3:
-                    print(f"  Warning: Skipping triangle {tri_idx} - insufficient vertices")
-                    continue
+        # pra.wall_factory expects vertices in shape (3, N)
+        # and they should be scaled down.
+        triangles = model_vertices[:n_model_triangles * 3].reshape(-1, 3, 3)
+        triangles = triangles[tri_indices[valid]] * scale_factor
 
-                pra_vertices = triangle_verts.T * scale_factor
-                triangles_processed += 1
-                
-                walls.append(
-                    pra.wall_factory(
-                        pra_vertices,
-                        material.energy_absorption["coeffs"],
-                        material.scattering["coeffs"],
-                    )
-                )
-        
-        print(f'Created {len(walls)} walls from {triangles_processed} triangles')
-        
-        if len(walls) == 0:
-            raise ValueError("No valid walls created from the 3D model")
+        # Drop degenerate (zero-area) triangles with one vectorized cross
+        # product over all faces; they enclose no surface but would still
+        # cost a wall in every image-source and ray-tracing pass
+        normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        non_degenerate = np.einsum('ij,ij->i', normals, normals) > 0
+        if not non_degenerate.all():
+            print(f"  Warning: Skipping {np.count_nonzero(~non_degenerate)} degenerate triangles")
+            triangles = triangles[non_degenerate]
 
         fs, signal = wavfile.read(source_file)
         signal = signal.astype(np.float32) / 32768.0  # required.
@@ -186,82 +325,44 @@ class Acoustic(pra.room.Room):
         print(f'Microphone array shape: {mic_array.shape}')
         print(f'Signal shape: {signal.shape}')
 
-        room = (
-            pra.Room(
-                walls,
-                fs=fs,
-                max_order=3,
-                ray_tracing=True,
-                air_absorption=True,
-            )
-            .add_source(cent, signal=signal)
-            .add_microphone_array(mic_array)
-        )
-        
-        # Set the number of rays manually to avoid calculation errors
-        room.set_ray_tracing(n_rays=1000)
-
-        print('Room volume: ', room.volume)
-        
-        # Validate room was created successfully
-        if room.volume <= 0:
-            raise ValueError("Invalid room geometry: room volume is zero or negative")
-        
-        # Check if volume is suspiciously small (less than 1 cubic unit after scaling)
-        if room.volume < 1e-3:
-            print(f"WARNING: Room volume is very small ({room.volume:.2e} cubic units)")
-            print("This may indicate an open mesh (e.g., pyramid without bottom face)")
-            print("PyRoomAcoustics requires closed meshes for proper simulation")
-
-        try:
-            # compute the rir
-            print('Image source model')
-            room.image_source_model()
-            
-            print('Ray tracing')
-            room.ray_tracing()
-            
-            print('Compute RIR')
-            room.compute_rir()
-            
-            print('Plotting RIR')
-            room.plot_rir()
+        # The RIR only depends on the geometry, the source/mic positions and
+        # the sample rate, so a new source signal in an unchanged room can
+        # skip straight to the convolution step
+        cache_key = self._rir_cache_key(triangles, cent, mic_array, fs)
+        rirs = self._rir_cache.get(cache_key)
+        if rirs is None:
+            rirs = self._compute_rirs(triangles, material, fs, cent, signal, mic_array)
+            if len(self._rir_cache) >= RIR_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._rir_cache[next(iter(self._rir_cache))]
+            self._rir_cache[cache_key] = rirs
+        else:
+            print('Reusing cached RIR for unchanged room geometry')
 
-            print('Simulating room acoustics')
-            room.simulate()
-        except (ValueError, IndexError, ZeroDivisionError) as e:
-            # These errors often indicate geometry problems
-            raise ValueError(
-                f"Room geometry is invalid for acoustic simulation: {str(e)}\n"
-                f"Possible causes:\n"
-                f"  - Mesh is not closed (has holes or open faces)\n"
-                f"  - Mesh is too small or too complex\n"
-                f"  - Try using a closed mesh like a box or room with all faces"
-            ) from e
-        except Exception as e:
-            raise RuntimeError(f"PyRoomAcoustics simulation failed: {str(e)}") from e
+        print('Simulating room acoustics')
+        mic_signals = self._convolve_rirs(signal, rirs)
 
         # show the room
         # room.plot(img_order=1)
         # plt.show()
 
-        print(f'Shapes:\n Original:{signal.shape}\n Simulation:{room.mic_array.signals.shape}')
+        print(f'Shapes:\n Original:{signal.shape}\n Simulation:{mic_signals.shape}')
 
         # Validate simulation output
-        if room.mic_array.signals is None or len(room.mic_array.signals) == 0:
+        if mic_signals is None or len(mic_signals) == 0:
             raise RuntimeError("Simulation produced no audio output")
         
         # Get the simulated signal from the first microphone
-        simulated_signal = room.mic_array.signals[0, :]
+        simulated_signal = mic_signals[0, :]
         
         # Normalize the signal to prevent clipping
         # The simulated signal is in float format, normalize to [-1, 1] range
-        max_val = np.abs(simulated_signal).max()
-        if max_val > 0:
-            simulated_signal = simulated_signal / max_val * 0.95  # Leave some headroom
-        
-        # Convert from float32 [-1, 1] to int16 [-32768, 32767] for WAV file
-        simulated_signal_int16 = np.int16(simulated_signal * 32767)
+        # (leaving some headroom) and scale to int16 [-32768, 32767] for the
+        # WAV file. mic_signals is freshly allocated for this call, so the
+        # scaling is done in place rather than through full-length temporaries.
+        max_val = max(simulated_signal.max(), -simulated_signal.min())
+        simulated_signal *= 32767 * (0.95 / max_val if max_val > 0 else 1.0)
+        simulated_signal_int16 = simulated_signal.astype(np.int16)
         
         print(f'Audio stats: min={simulated_signal_int16.min()}, max={simulated_signal_int16.max()}, length={len(simulated_signal_int16)}')
         
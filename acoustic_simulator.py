@@ -83,24 +83,26 @@ class AcousticSimulator:
 
         # Build walls list from renderer's triangle data
         print("\nBuilding room geometry...")
-        walls = []
-        for wall_info in walls_from_render:
-            for tri_idx in wall_info['triangles']:
-                triangle_verts = model_vertices[tri_idx * 3 : tri_idx * 3 + 3]
-
-                if triangle_verts.shape[0] < 3:
-                    continue
-
-                # Scale down to realistic room size
-                pra_vertices = triangle_verts.T / SIZE_REDUCTION_FACTOR
-
-                walls.append(
-                    pra.wall_factory(
-                        pra_vertices,
-                        material.energy_absorption["coeffs"],
-                        material.scattering["coeffs"],
-                    )
-                )
+        # Lay all referenced triangles out as one contiguous (n, 3, 3) array
+        # and scale them in a single operation instead of slicing and
+        # scaling model_vertices per triangle
+        tri_indices = np.fromiter(
+            (tri_idx for wall_info in walls_from_render for tri_idx in wall_info['triangles']),
+            dtype=np.intp,
+        )
+        n_model_triangles = len(model_vertices) // 3
+        tri_indices = tri_indices[tri_indices < n_model_triangles]
+        triangles = model_vertices[:n_model_triangles * 3].reshape(-1, 3, 3)
+
+        # Scale down to realistic room size
+        triangles = triangles[tri_indices] / SIZE_REDUCTION_FACTOR
+
+        # Same wall construction as Acoustic._make_walls_batch: look the
+        # coefficients up once rather than once per wall
+        absorption = material.energy_absorption["coeffs"]
+        scattering = material.scattering["coeffs"]
+        # pra.wall_factory expects vertices in shape (3, N)
+        walls = [pra.wall_factory(triangle.T, absorption, scattering) for triangle in triangles]
 
         print(f"Created {len(walls)} wall triangles")
 
@@ -160,7 +162,6 @@ class AcousticSimulator:
                 walls,
                 fs=fs,
                 max_order=max_order,
-                ray_tracing=True,
                 air_absorption=True,
             )
 
@@ -170,7 +171,8 @@ class AcousticSimulator:
             # Add microphone array
             room.add_microphone_array(mic_array)
 
-            # Set ray tracing parameters
+            # Enable ray tracing once with the requested parameters, rather
+            # than letting the constructor configure volume-based defaults
             room.set_ray_tracing(n_rays=n_rays)
 
             print(f"  Room volume: {room.volume:.2f} m³")
@@ -191,19 +193,20 @@ class AcousticSimulator:
 
                 print(f"  Simulation complete!")
 
+                # Convert every listener's signal to int16 in one batched
+                # operation over the (n_mics, n_samples) output matrix
+                output_signals_int16 = np.int16(room.mic_array.signals * 32767)
+
                 # Save output for each listener
+                source_name = sound_source.name.replace(" ", "_")
                 for listener_idx, listener in enumerate(scene_manager.listeners):
-                    output_signal = room.mic_array.signals[listener_idx, :]
-
                     # Generate output filename
                     listener_name = listener.name.replace(" ", "_")
-                    source_name = sound_source.name.replace(" ", "_")
                     output_filename = f"{listener_name}_from_{source_name}.wav"
                     output_path = os.path.join(output_dir, output_filename)
 
                     # Write output audio
-                    output_signal_int16 = np.int16(output_signal * 32767)
-                    wavfile.write(output_path, fs, output_signal_int16)
+                    wavfile.write(output_path, fs, output_signals_int16[listener_idx, :])
                     print(f"    Saved: {output_filename}")
 
             except Exception as e:
@@ -3,7 +3,6 @@ PyRoomStudio - 3D Acoustic Simulation GUI
 Main entry point for the application.
 """
 import pygame
-import os
 
 # Initialize pygame
 pygame.init()
@@ -1,16 +1,97 @@
 import pygame
-from pygame.locals import *
-from OpenGL.GL import *
-from OpenGL.GLU import *
+from OpenGL.GL import (
+    glBegin, glBindBuffer, glBindTexture, glBlendFunc, glBufferData, glClear,
+    glClearColor, glColor3f, glColor4f, glColorPointer, glDisable,
+    glDisableClientState, glDrawArrays, glDrawElements, glEnable,
+    glEnableClientState, glEnd, glGenBuffers, glGenTextures, glGenerateMipmap,
+    glGetDoublev, glGetIntegerv, glLineWidth, glLoadIdentity, glMatrixMode,
+    glMultMatrixf, glPopAttrib, glPopMatrix, glPushAttrib, glPushMatrix,
+    glScissor, glTexCoordPointer, glTexImage2D, glTexParameteri, glVertex3f,
+    glVertexPointer, glViewport, GL_ARRAY_BUFFER, GL_BLEND, GL_CLAMP_TO_EDGE,
+    GL_COLOR_ARRAY, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT, GL_DEPTH_TEST,
+    GL_DYNAMIC_DRAW, GL_ELEMENT_ARRAY_BUFFER, GL_FLOAT, GL_LIGHTING, GL_LINEAR,
+    GL_LINEAR_MIPMAP_LINEAR, GL_LINES, GL_MODELVIEW, GL_MODELVIEW_MATRIX,
+    GL_ONE_MINUS_SRC_ALPHA, GL_PROJECTION, GL_PROJECTION_MATRIX, GL_RGB,
+    GL_SCISSOR_BIT, GL_SCISSOR_TEST, GL_SRC_ALPHA, GL_STATIC_DRAW,
+    GL_TEXTURE_2D, GL_TEXTURE_COORD_ARRAY, GL_TEXTURE_MAG_FILTER,
+    GL_TEXTURE_MIN_FILTER, GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T, GL_TRIANGLES,
+    GL_UNSIGNED_BYTE, GL_UNSIGNED_INT, GL_VERTEX_ARRAY, GL_VIEWPORT,
+    GL_VIEWPORT_BIT,
+)
+from OpenGL.GLU import gluLookAt, gluPerspective
 import numpy as np
-from stl import mesh
-import math
-import sys
-from acoustic import Acoustic
-import collections
+from stl import mesh, Mode
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import os
 import random
 from PIL import Image
 
+
+def is_binary_stl(filename):
+    """
+    Check whether an STL file is binary from its size alone.
+    A binary STL is exactly 84 + 50 * n bytes, with the triangle count n
+    stored at bytes 80:84. ASCII files may legally start with 'solid' too,
+    so the header text cannot be trusted.
+    """
+    with open(filename, 'rb') as f:
+        f.seek(80)
+        count = int.from_bytes(f.read(4), 'little')
+    return os.path.getsize(filename) == 84 + 50 * count
+
+
+def load_model(filename):
+    """
+    Load a triangle mesh from disk as a numpy-stl Mesh.
+    STL files are read directly by numpy-stl; other formats (e.g. OBJ) are
+    parsed by trimesh and converted to the same representation.
+    """
+    if os.path.splitext(filename)[1].lower() == '.stl':
+        # Skip numpy-stl's ASCII parse attempt on binary files whose
+        # header happens to start with 'solid'
+        mode = Mode.BINARY if is_binary_stl(filename) else Mode.AUTOMATIC
+        return mesh.Mesh.from_file(filename, mode=mode)
+
+    # Imported here so STL-only sessions don't pay for loading trimesh
+    import trimesh
+
+    # process=False skips trimesh's vertex merging/validation pass, which
+    # dominates load time and is not needed for rendering or simulation
+    tm = trimesh.load(filename, force='mesh', process=False, skip_materials=True)
+    vertices = np.ascontiguousarray(tm.vertices, dtype=np.float32)
+    faces = np.ascontiguousarray(tm.faces, dtype=np.int32)
+
+    data = np.zeros(len(faces), dtype=mesh.Mesh.dtype)
+    data['vectors'] = vertices[faces]
+    return mesh.Mesh(data)
+
+
+def load_texture_image(filename):
+    """
+    Decode a texture image into the layout uploaded by Render.load_texture:
+    RGB, bottom-left origin and power-of-2 dimensions.
+    Touches no OpenGL state, so it can run on a worker thread.
+    """
+    image = Image.open(filename)
+    image = image.transpose(Image.FLIP_TOP_BOTTOM)  # OpenGL expects bottom-left origin
+    
+    # Convert to RGB if it's not already
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    # Ensure power-of-2 dimensions for better compatibility
+    width, height = image.size
+    if not (width & (width - 1) == 0) or not (height & (height - 1) == 0):
+        # Resize to nearest power of 2
+        new_width = 2 ** (width - 1).bit_length()
+        new_height = 2 ** (height - 1).bit_length()
+        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        print(f"Resized texture to {new_width}x{new_height} for better compatibility")
+    
+    return image
+
+
 class Render:
     def __init__(self, filename, view_rect, window_height):
         self.view_rect = view_rect
@@ -24,8 +105,32 @@ class Render:
         glEnable(GL_TEXTURE_2D)  # Enable texturing
         glClearColor(1.0, 1.0, 1.0, 1.0) # This will be cleared over by the GUI background
 
-        self.model = mesh.Mesh.from_file(filename)
+        # Decode the texture image on a worker thread; the GL upload is
+        # deferred until a surface is first textured (see texture_id)
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._texture_image = executor.submit(load_texture_image, "cat.png")
+        executor.shutdown(wait=False)
+        self._texture_id = None
+
+        self.model = load_model(filename)
+
+        # Per-triangle origin vertex and edge vectors, laid out as separate
+        # (n_triangles, 3) arrays for vectorized ray picking
+        vectors = self.model.vectors.astype(np.float64)
+        self.tri_v0 = vectors[:, 0]
+        self.tri_e1 = vectors[:, 1] - vectors[:, 0]
+        self.tri_e2 = vectors[:, 2] - vectors[:, 0]
+
+        # Unit triangle normals, normalized once for feature edge detection
+        # and texture mapping. Degenerate triangles have a zero normal in the
+        # STL and end up as NaN here, which both consumers ignore.
+        normals = self.model.normals.astype(np.float32)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.tri_normals = normals / np.linalg.norm(normals, axis=1, keepdims=True)
+
         self.center, self.size = self.compute_center_and_size()
+        self._model_matrix_key = None  # (scale, center) _model_matrix was built for
+        self._model_matrix = None
         
         # Scale factor for model (1.0 = original size)
         self.model_scale_factor = 1.0
@@ -41,16 +146,30 @@ class Render:
         # Note: camera distances are set by auto_normalize_scale via set_scale_factor
         self.camera_heading = 35.0  # degrees
         self.camera_pitch = 35.0    # degrees
+        self._camera_cache_key = None  # (heading, pitch, distance) of _camera_position
+        self._camera_position = None
         self.mouse_down = False
         self.last_mouse_pos = None
         self.mouse_down_pos = None  # Track where mouse was pressed
         self.transparent_mode = False  # Track transparency state
+        # Set whenever the camera, scale or surfaces change and cleared by
+        # draw_scene, so the caller's main loop can skip redrawing an
+        # unchanged view. Code that changes the view directly must set it too.
+        self.needs_redraw = True
 
         # The following is no longer needed since GUI now controls the main loop
         # self.running = True
 
-        # Load texture
-        self.texture_id = self.load_texture("cat.png")
+        # Give every distinct vertex position an integer id so edges can be
+        # keyed by int pairs instead of tuples of float coordinates. Adding
+        # 0.0 folds -0.0 into 0.0, which compare equal but differ bytewise.
+        self.unique_vertices, inverse = np.unique(
+            self.model.vectors.reshape(-1, 3) + 0.0, axis=0, return_inverse=True)
+        self.tri_vids = inverse.reshape(-1, 3)
+
+        # Build the edge adjacency once; it is shared by feature edge
+        # detection and surface grouping
+        self.edge_to_triangles, self.triangle_edges = self.build_edge_map()
 
         # Build edge map for feature/boundary edge detection
         self.feature_edges = self.compute_feature_edges(angle_threshold_degrees=10)
@@ -60,30 +179,62 @@ class Render:
         self.default_surface_color = [0.6, 0.8, 1.0]
         self.surface_colors = [self.default_surface_color[:] for _ in self.surfaces]
         self.surface_materials = [None for _ in self.surfaces]  # None = no texture, True = textured
+        # Incremented whenever surface_colors or surface_materials change, so
+        # callers (e.g. the GUI's surface list) can skip syncing when it is
+        # unchanged. Code that mutates those lists directly must bump it too.
+        self.colors_revision = 0
         # Map triangle index to surface index
-        self.triangle_to_surface = {}
+        self.triangle_surface = np.empty(len(self.model.vectors), dtype=np.intp)
         for surf_idx, surf in enumerate(self.surfaces):
-            for tri_idx in surf:
-                self.triangle_to_surface[tri_idx] = surf_idx
+            self.triangle_surface[list(surf)] = surf_idx
+
+        # Vertex positions and texture coordinates never change, so upload
+        # them once; colors and the indices of untextured and textured
+        # triangles are refreshed by update_surface_buffers
+        vertices = np.ascontiguousarray(self.model.vectors.reshape(-1, 3), dtype=np.float32)
+        tex_coords = self.compute_texture_coords()
+        (self.vertex_vbo, self.color_vbo, self.index_vbo, self.edge_vbo,
+         self.texcoord_vbo, self.textured_index_vbo) = glGenBuffers(6)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, self.texcoord_vbo)
+        glBufferData(GL_ARRAY_BUFFER, tex_coords.nbytes, tex_coords, GL_STATIC_DRAW)
 
-    def load_texture(self, filename):
-        """Load a texture from file and return the OpenGL texture ID"""
+        # The feature edges are static too: flatten them once into a line
+        # list instead of walking the edge set every frame
+        edge_vids = np.array(list(self.feature_edges), dtype=np.intp).reshape(-1, 2)
+        edge_vertices = np.ascontiguousarray(self.unique_vertices[edge_vids].reshape(-1, 3), dtype=np.float32)
+        self.edge_vertex_count = len(edge_vertices)
+        glBindBuffer(GL_ARRAY_BUFFER, self.edge_vbo)
+        glBufferData(GL_ARRAY_BUFFER, edge_vertices.nbytes, edge_vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.untextured_index_count = 0
+        self.textured_index_count = 0
+        self._surface_buffer_state = None
+
+    @property
+    def texture_id(self):
+        """
+        OpenGL texture ID of the surface texture, or None if it failed to load.
+        The texture is uploaded on first access, so startup does not wait for
+        the image decode when no surface is ever textured.
+        """
+        if self._texture_image is not None:
+            self._texture_id = self.load_texture("cat.png", self._texture_image)
+            self._texture_image = None
+        return self._texture_id
+
+    def load_texture(self, filename, image_future=None):
+        """
+        Load a texture from file and return the OpenGL texture ID.
+        If image_future is given, it holds the result of an already submitted
+        load_texture_image(filename) call and only the upload is done here.
+        """
         try:
-            image = Image.open(filename)
-            image = image.transpose(Image.FLIP_TOP_BOTTOM)  # OpenGL expects bottom-left origin
-            
-            # Convert to RGB if it's not already
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Ensure power-of-2 dimensions for better compatibility
-            width, height = image.size
-            if not (width & (width - 1) == 0) or not (height & (height - 1) == 0):
-                # Resize to nearest power of 2
-                new_width = 2 ** (width - 1).bit_length()
-                new_height = 2 ** (height - 1).bit_length()
-                image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                print(f"Resized texture to {new_width}x{new_height} for better compatibility")
+            if image_future is not None:
+                image = image_future.result()
+            else:
+                image = load_texture_image(filename)
             
             image_data = image.tobytes()
             
@@ -102,74 +253,73 @@ class Render:
             print(f"Error loading texture {filename}: {e}")
             return None
 
-    def get_texture_coords_from_normal(self, vertex, normal, surface_bounds=None):
-        """Calculate texture coordinates based on surface normal direction"""
-        # Normalize the normal vector
-        normal = normal / np.linalg.norm(normal)
-        
-        # Use world coordinates directly for more predictable mapping
-        # This avoids the complex normal-based coordinate system that was causing issues
-        
-        # Get the dominant axis of the normal to determine the mapping plane
-        abs_normal = np.abs(normal)
-        dominant_axis = np.argmax(abs_normal)
-        
-        if dominant_axis == 0:  # Normal mostly in X direction
-            # Map using Y and Z coordinates
-            tex_x = vertex[1]  # Y coordinate
-            tex_y = vertex[2]  # Z coordinate
-        elif dominant_axis == 1:  # Normal mostly in Y direction
-            # Map using X and Z coordinates
-            tex_x = vertex[0]  # X coordinate
-            tex_y = vertex[2]  # Z coordinate
-        else:  # Normal mostly in Z direction (dominant_axis == 2)
-            # Map using X and Y coordinates
-            tex_x = vertex[0]  # X coordinate
-            tex_y = vertex[1]  # Y coordinate
-        
-        # If we have surface bounds, normalize to the surface extent
-        if surface_bounds:
-            min_x, max_x, min_y, max_y = surface_bounds
-            range_x = max_x - min_x
-            range_y = max_y - min_y
-            
-            # Normalize coordinates
-            if range_x > 0:
-                tex_x = (tex_x - min_x) / range_x
-            else:
-                tex_x = 0.5
-            if range_y > 0:
-                tex_y = (tex_y - min_y) / range_y
-            else:
-                tex_y = 0.5
-        else:
-            # Fallback to simple mapping if no bounds provided
-            # Scale and center the coordinates
-            tex_x = tex_x * 0.1 + 0.5  # Scale down and center
-            tex_y = tex_y * 0.1 + 0.5  # Scale down and center
-        
-        # Ensure coordinates are within [0, 1] range
-        tex_x = max(0.0, min(1.0, tex_x))
-        tex_y = max(0.0, min(1.0, tex_y))
+    def compute_texture_coords(self):
+        """
+        Texture coordinates of every vertex, laid out like the vertex buffer.
+        Each vertex is projected onto the plane perpendicular to the dominant
+        axis of its triangle's normal (e.g. Y/Z for a mostly-X normal) and
+        normalized to the bounds of its surface in [0, 1]. The bounds are
+        taken in the plane of the surface's first triangle; surfaces with no
+        extent along a texture axis map to 0.5 on it.
         
-        return [tex_x, tex_y]
+        Returns:
+            np.ndarray: (n_triangles * 3, 2) float32 array
+        """
+        vertices = self.model.vectors
+        n_tris = len(vertices)
+        # Coordinates spanning the plane perpendicular to the X, Y and Z axes
+        planes = np.array([[1, 2], [0, 2], [0, 1]])
+        
+        def project(axis_per_triangle):
+            columns = np.broadcast_to(planes[axis_per_triangle][:, np.newaxis, :], (n_tris, 3, 2))
+            return np.take_along_axis(vertices, columns, axis=2)
+        
+        tri_axis = np.argmax(np.abs(self.tri_normals), axis=1)
+        first_tri = np.array([min(surf) for surf in self.surfaces])
+        surface_coords = project(tri_axis[first_tri][self.triangle_surface])
+        
+        n_surfaces = len(self.surfaces)
+        lower = np.full((n_surfaces, 2), np.inf, dtype=np.float32)
+        upper = np.full((n_surfaces, 2), -np.inf, dtype=np.float32)
+        np.minimum.at(lower, self.triangle_surface, surface_coords.min(axis=1))
+        np.maximum.at(upper, self.triangle_surface, surface_coords.max(axis=1))
+        extent = (upper - lower)[self.triangle_surface][:, np.newaxis, :]
+        lower = lower[self.triangle_surface][:, np.newaxis, :]
+
+        # Flat surfaces (zero extent) map to the middle of the texture
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tex_coords = np.where(extent > 0, (project(tri_axis) - lower) / extent, 0.5)
+        tex_coords = np.clip(tex_coords, 0.0, 1.0)
+        return np.ascontiguousarray(tex_coords.reshape(-1, 2), dtype=np.float32)
 
     def random_color(self):
         return [random.uniform(0.2, 0.9), random.uniform(0.2, 0.9), random.uniform(0.2, 0.9)]
 
+    def build_edge_map(self):
+        """
+        Map each undirected edge to the triangles that share it.
+        
+        Returns:
+            tuple: (edge_to_triangles, triangle_edges) where edge_to_triangles
+            maps an edge key to a list of triangle indices and
+            triangle_edges[tri_idx] lists the three edge keys of a triangle.
+            An edge key is the sorted pair of its vertex ids in self.tri_vids.
+        """
+        # (n_triangles, 3, 2) vertex id pairs, each pair sorted ascending
+        edge_vids = np.stack([self.tri_vids, np.roll(self.tri_vids, -1, axis=1)], axis=2)
+        edge_vids.sort(axis=2)
+        edge_to_triangles = {}
+        triangle_edges = []
+        for tri_idx, pairs in enumerate(edge_vids.tolist()):
+            edges = [tuple(pair) for pair in pairs]
+            for edge in edges:
+                edge_to_triangles.setdefault(edge, []).append(tri_idx)
+            triangle_edges.append(edges)
+        return edge_to_triangles, triangle_edges
+
     def group_triangles_into_surfaces(self):
         # Use BFS to group triangles connected without crossing a feature edge
-        triangles = self.model.vectors
-        n_tris = len(triangles)
-        edge_to_triangles = {}
-        for tri_idx, tri in enumerate(triangles):
-            for i in range(3):
-                v1 = tuple(tri[i])
-                v2 = tuple(tri[(i+1)%3])
-                edge = tuple(sorted([v1, v2]))
-                if edge not in edge_to_triangles:
-                    edge_to_triangles[edge] = []
-                edge_to_triangles[edge].append(tri_idx)
+        n_tris = len(self.model.vectors)
         visited = [False] * n_tris
         surfaces = []
         for tri_idx in range(n_tris):
@@ -177,106 +327,146 @@ class Render:
                 continue
             # Start a new surface
             surface = set()
-            queue = [tri_idx]
+            queue = deque([tri_idx])
             while queue:
-                t = queue.pop()
+                t = queue.popleft()
                 if visited[t]:
                     continue
                 visited[t] = True
                 surface.add(t)
-                tri = triangles[t]
-                for i in range(3):
-                    v1 = tuple(tri[i])
-                    v2 = tuple(tri[(i+1)%3])
-                    edge = tuple(sorted([v1, v2]))
+                for edge in self.triangle_edges[t]:
                     if edge in self.feature_edges:
                         continue  # Don't cross feature edge
                     # Add neighboring triangle sharing this edge
-                    for neighbor in edge_to_triangles[edge]:
+                    for neighbor in self.edge_to_triangles[edge]:
                         if not visited[neighbor]:
                             queue.append(neighbor)
             surfaces.append(surface)
         return surfaces
 
     def compute_center_and_size(self):
-        min_ = np.min(self.model.vectors.reshape(-1, 3), axis=0)
-        max_ = np.max(self.model.vectors.reshape(-1, 3), axis=0)
+        # The mesh never changes after loading, so keep its bounds for the
+        # measurement grid and get_real_world_dimensions
+        vertices = self.model.vectors.reshape(-1, 3)
+        self.bounds_min = min_ = vertices.min(axis=0)
+        self.bounds_max = max_ = vertices.max(axis=0)
         center = (min_ + max_) / 2
         size = np.linalg.norm(max_ - min_)
         return center, size
 
     def compute_feature_edges(self, angle_threshold_degrees=30):
-        # Map edges to the triangles that share them
-        edge_to_triangles = {}
-        triangles = self.model.vectors
-        normals = self.model.normals
-        for tri_idx, tri in enumerate(triangles):
-            for i in range(3):
-                v1 = tuple(tri[i])
-                v2 = tuple(tri[(i+1)%3])
-                edge = tuple(sorted([v1, v2]))
-                if edge not in edge_to_triangles:
-                    edge_to_triangles[edge] = []
-                edge_to_triangles[edge].append(tri_idx)
+        normals = self.tri_normals
         feature_edges = set()
         threshold_rad = np.radians(angle_threshold_degrees)
-        for edge, tris in edge_to_triangles.items():
+        shared_edges = []
+        shared_tris = []
+        for edge, tris in self.edge_to_triangles.items():
             if len(tris) == 1:
                 # Boundary edge
                 feature_edges.add(edge)
             elif len(tris) == 2:
-                n1 = normals[tris[0]]
-                n2 = normals[tris[1]]
-                angle = np.arccos(np.clip(np.dot(n1, n2) / (np.linalg.norm(n1) * np.linalg.norm(n2)), -1.0, 1.0))
-                if angle > threshold_rad:
+                shared_edges.append(edge)
+                shared_tris.append(tris)
+        if shared_tris:
+            # Compute the angle between the normals of every edge shared by
+            # two triangles in one batch instead of one edge at a time
+            shared_tris = np.array(shared_tris)
+            n1 = normals[shared_tris[:, 0]]
+            n2 = normals[shared_tris[:, 1]]
+            cos_angles = np.einsum('ij,ij->i', n1, n2)
+            angles = np.arccos(np.clip(cos_angles, -1.0, 1.0))
+            for edge, is_feature in zip(shared_edges, angles > threshold_rad):
+                if is_feature:
                     feature_edges.add(edge)
         return feature_edges
 
     def update_camera(self):
         glLoadIdentity()
-        heading_rad = np.radians(self.camera_heading)
-        pitch_rad = np.radians(self.camera_pitch)
-        x = self.camera_distance * np.sin(heading_rad) * np.cos(pitch_rad)
-        y = -self.camera_distance * np.cos(heading_rad) * np.cos(pitch_rad)
-        z = self.camera_distance * np.sin(pitch_rad)
+        # The camera is set up several times per frame (grid, model, picking)
+        # and is usually still, so only redo the trig when it has moved
+        camera = (self.camera_heading, self.camera_pitch, self.camera_distance)
+        if camera != self._camera_cache_key:
+            heading_rad = np.radians(self.camera_heading)
+            pitch_rad = np.radians(self.camera_pitch)
+            x = self.camera_distance * np.sin(heading_rad) * np.cos(pitch_rad)
+            y = -self.camera_distance * np.cos(heading_rad) * np.cos(pitch_rad)
+            z = self.camera_distance * np.sin(pitch_rad)
+            self._camera_cache_key = camera
+            self._camera_position = (x, y, z)
+        x, y, z = self._camera_position
         gluLookAt(x, y, z, 0, 0, 0, 0, 0, 1)
 
     def get_ray_from_mouse(self, mouse_pos):
         viewport = glGetIntegerv(GL_VIEWPORT)
-        modelview = glGetDoublev(GL_MODELVIEW_MATRIX)
-        projection = glGetDoublev(GL_PROJECTION_MATRIX)
+        # GL returns column-major matrices, so transpose to row-major
+        modelview = np.asarray(glGetDoublev(GL_MODELVIEW_MATRIX), dtype=np.float64).reshape(4, 4).T
+        projection = np.asarray(glGetDoublev(GL_PROJECTION_MATRIX), dtype=np.float64).reshape(4, 4).T
         x = mouse_pos[0]
         y = viewport[3] - mouse_pos[1]
-        near = gluUnProject(x, y, 0.0, modelview, projection, viewport)
-        far = gluUnProject(x, y, 1.0, modelview, projection, viewport)
-        ray_origin = np.array(near)
-        ray_dir = np.array(far) - np.array(near)
+        # Unproject the near and far points together with a single inverse
+        # of the model-view-projection matrix (what gluUnProject does per point)
+        ndc_x = 2.0 * (x - viewport[0]) / viewport[2] - 1.0
+        ndc_y = 2.0 * (y - viewport[1]) / viewport[3] - 1.0
+        clip = np.array([[ndc_x, ndc_y, -1.0, 1.0],
+                         [ndc_x, ndc_y, 1.0, 1.0]])
+        world = clip @ np.linalg.inv(projection @ modelview).T
+        near, far = world[:, :3] / world[:, 3:]
+        ray_origin = near
+        ray_dir = far - near
         ray_dir = ray_dir / np.linalg.norm(ray_dir)
         return ray_origin, ray_dir
 
-    def ray_triangle_intersect(self, ray_origin, ray_dir, triangle):
-        # Möller–Trumbore intersection
-        v0, v1, v2 = triangle
+    def intersect_all(self, ray_origin, ray_dir):
+        """
+        Möller–Trumbore intersection of a ray against every triangle at once.
+        Returns the index of the closest triangle hit, or None.
+        """
         eps = 1e-8
-        edge1 = v1 - v0
-        edge2 = v2 - v0
-        h = np.cross(ray_dir, edge2)
-        a = np.dot(edge1, h)
-        if -eps < a < eps:
-            return None  # Parallel
-        f = 1.0 / a
-        s = ray_origin - v0
-        u = f * np.dot(s, h)
-        if u < 0.0 or u > 1.0:
-            return None
-        q = np.cross(s, edge1)
-        v = f * np.dot(ray_dir, q)
-        if v < 0.0 or u + v > 1.0:
+        h = np.cross(ray_dir, self.tri_e2)
+        a = np.einsum('ij,ij->i', self.tri_e1, h)
+        # Reject triangles as early as possible so that each later test only
+        # runs on the candidates that survived the previous one
+        idx = np.flatnonzero(np.abs(a) >= eps)
+        f = 1.0 / a[idx]
+        s = ray_origin - self.tri_v0[idx]
+        u = f * np.einsum('ij,ij->i', s, h[idx])
+        keep = (u >= 0.0) & (u <= 1.0)
+        idx, f, s, u = idx[keep], f[keep], s[keep], u[keep]
+        q = np.cross(s, self.tri_e1[idx])
+        v = f * (q @ ray_dir)
+        keep = (v >= 0.0) & (u + v <= 1.0)
+        idx, f, q = idx[keep], f[keep], q[keep]
+        t = f * np.einsum('ij,ij->i', self.tri_e2[idx], q)
+        keep = t > eps
+        if not keep.any():
             return None
-        t = f * np.dot(edge2, q)
-        if t > eps:
-            return t
-        return None
+        return int(idx[keep][np.argmin(t[keep])])
+
+    def get_model_matrix(self):
+        """
+        Return the model transform (center the model at the origin, then
+        scale it) as a column-major float32 matrix for glMultMatrixf.
+        It is rebuilt only when the scale factor or center changes.
+        """
+        key = (self.model_scale_factor, tuple(self.center))
+        if key != self._model_matrix_key:
+            scale = self.model_scale_factor
+            matrix = np.diag([scale, scale, scale, 1.0])
+            matrix[:3, 3] = -scale * np.asarray(self.center, dtype=np.float64)
+            # GL expects column-major order
+            self._model_matrix = np.ascontiguousarray(matrix.T, dtype=np.float32)
+            self._model_matrix_key = key
+        return self._model_matrix
+
+    def pick_triangle(self, mouse_pos):
+        """Return the index of the triangle under the mouse position, or None"""
+        # Ensure OpenGL matrices are up-to-date for ray picking
+        glPushMatrix()
+        self.update_camera()
+        glMultMatrixf(self.get_model_matrix())
+        ray_origin, ray_dir = self.get_ray_from_mouse(mouse_pos)
+        glPopMatrix()
+        return self.intersect_all(ray_origin, ray_dir)
 
     def draw_measurement_grid(self):
         """
@@ -286,15 +476,11 @@ class Render:
         glPushMatrix()
         self.update_camera()
         
-        # Apply same scaling as model
-        glScalef(self.model_scale_factor, self.model_scale_factor, self.model_scale_factor)
-        
-        # Apply same translation as model to align the grid
-        glTranslatef(-self.center[0], -self.center[1], -self.center[2])
+        # Apply same scaling and translation as model to align the grid
+        glMultMatrixf(self.get_model_matrix())
         
         # Get model bounds to position grid appropriately
-        min_ = np.min(self.model.vectors.reshape(-1, 3), axis=0)
-        max_ = np.max(self.model.vectors.reshape(-1, 3), axis=0)
+        min_, max_ = self.bounds_min, self.bounds_max
         
         # Position grid exactly at the bottom of the model (min Z)
         grid_z = min_[2]
@@ -349,106 +535,89 @@ class Render:
         
         glPopMatrix()
     
+    def update_surface_buffers(self):
+        """
+        Rebuild the per-vertex color buffer and the index buffers of untextured
+        and textured triangles if surface colors, materials or transparency
+        changed since they were last uploaded.
+        """
+        state = (
+            self.transparent_mode,
+            tuple(tuple(color) for color in self.surface_colors),
+            tuple(bool(material) for material in self.surface_materials),
+        )
+        if state == self._surface_buffer_state:
+            return
+        self._surface_buffer_state = state
+        
+        # Colors are uploaded as normalized RGBA bytes, a quarter of the size
+        # of float32 components
+        surface_rgba = np.empty((len(self.surfaces), 4), dtype=np.float32)
+        surface_rgba[:, :3] = self.surface_colors
+        surface_rgba[:, 3] = 0.3 if self.transparent_mode else 1.0
+        surface_rgba = np.rint(np.clip(surface_rgba, 0.0, 1.0) * 255).astype(np.uint8)
+        vertex_colors = np.repeat(surface_rgba[self.triangle_surface], 3, axis=0)
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertex_colors.nbytes, vertex_colors, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        
+        textured = np.array(state[2], dtype=bool)[self.triangle_surface]
+        self.untextured_index_count = self.upload_triangle_indices(self.index_vbo, np.flatnonzero(~textured))
+        self.textured_index_count = self.upload_triangle_indices(self.textured_index_vbo, np.flatnonzero(textured))
+
+    def upload_triangle_indices(self, buffer, triangles):
+        """Upload the vertex indices of the given triangles to an element buffer and return their count"""
+        indices = (triangles[:, np.newaxis] * 3 + np.arange(3)).astype(np.uint32).ravel()
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, buffer)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        return len(indices)
+
     def draw_model(self):
         glPushMatrix()
         self.update_camera()
         
-        # Apply model scaling
-        glScalef(self.model_scale_factor, self.model_scale_factor, self.model_scale_factor)
-        
-        glTranslatef(-self.center[0], -self.center[1], -self.center[2])
-        triangles = self.model.vectors
-        normals = self.model.normals
-        
-        # Calculate surface bounds for textured surfaces
-        surface_bounds = {}
-        for surf_idx, material in enumerate(self.surface_materials):
-            if material and self.texture_id:
-                # Get all triangles in this surface
-                surface_triangles = [tri_idx for tri_idx, s_idx in self.triangle_to_surface.items() if s_idx == surf_idx]
-                
-                # Calculate bounds using the same coordinate system as texture mapping
-                if surface_triangles:
-                    # Use the first triangle's normal as reference
-                    ref_normal = normals[surface_triangles[0]]
-                    ref_normal = ref_normal / np.linalg.norm(ref_normal)
-                    
-                    # Get the dominant axis of the normal
-                    abs_normal = np.abs(ref_normal)
-                    dominant_axis = np.argmax(abs_normal)
-                    
-                    # Project all vertices using the same method as texture mapping
-                    tex_coords_x = []
-                    tex_coords_y = []
-                    for tri_idx in surface_triangles:
-                        triangle = triangles[tri_idx]
-                        for vertex in triangle:
-                            if dominant_axis == 0:  # Normal mostly in X direction
-                                tex_x = vertex[1]  # Y coordinate
-                                tex_y = vertex[2]  # Z coordinate
-                            elif dominant_axis == 1:  # Normal mostly in Y direction
-                                tex_x = vertex[0]  # X coordinate
-                                tex_y = vertex[2]  # Z coordinate
-                            else:  # Normal mostly in Z direction
-                                tex_x = vertex[0]  # X coordinate
-                                tex_y = vertex[1]  # Y coordinate
-                            tex_coords_x.append(tex_x)
-                            tex_coords_y.append(tex_y)
-                    
-                    surface_bounds[surf_idx] = (min(tex_coords_x), max(tex_coords_x), 
-                                               min(tex_coords_y), max(tex_coords_y))
-        
-        # Draw textured surfaces first
-        for tri_idx, triangle in enumerate(triangles):
-            surf_idx = self.triangle_to_surface[tri_idx]
-            material = self.surface_materials[surf_idx]
-            
-            if material and self.texture_id:
-                glEnable(GL_TEXTURE_2D)
-                glBindTexture(GL_TEXTURE_2D, self.texture_id)
-                glColor4f(1.0, 1.0, 1.0, 0.3 if self.transparent_mode else 1.0)  # White for texture
-                
-                # Get the normal for this triangle
-                normal = normals[tri_idx]
-                
-                # Get surface bounds for this surface
-                bounds = surface_bounds.get(surf_idx)
-                
-                glBegin(GL_TRIANGLES)
-                for i, vertex in enumerate(triangle):
-                    # Project texture coordinates based on surface normal and bounds
-                    tex_coords = self.get_texture_coords_from_normal(vertex, normal, bounds)
-                    glTexCoord2f(tex_coords[0], tex_coords[1])
-                    glVertex3fv(vertex)
-                glEnd()
-        
-        # Draw non-textured surfaces
-        for tri_idx, triangle in enumerate(triangles):
-            surf_idx = self.triangle_to_surface[tri_idx]
-            material = self.surface_materials[surf_idx]
-            
-            if not material:
-                glDisable(GL_TEXTURE_2D)
-                color = self.surface_colors[surf_idx]
-                alpha = 0.3 if self.transparent_mode else 1.0
-                glColor4f(color[0], color[1], color[2], alpha)
-                
-                glBegin(GL_TRIANGLES)
-                for vertex in triangle:
-                    glVertex3fv(vertex)
-                glEnd()
-        
-        # Disable texturing for edges
+        # Apply model scaling and centering
+        glMultMatrixf(self.get_model_matrix())
+        
+        self.update_surface_buffers()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_vbo)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        
+        # Draw textured surfaces first, in one call with the precomputed
+        # texture coordinates
+        if self.textured_index_count and self.texture_id:
+            glEnable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, self.texture_id)
+            glColor4f(1.0, 1.0, 1.0, 0.3 if self.transparent_mode else 1.0)  # White for texture
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, self.texcoord_vbo)
+            glTexCoordPointer(2, GL_FLOAT, 0, None)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.textured_index_vbo)
+            glDrawElements(GL_TRIANGLES, self.textured_index_count, GL_UNSIGNED_INT, None)
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        
+        # Draw non-textured surfaces from the vertex buffers in one call;
+        # this also leaves texturing disabled for the edges below
         glDisable(GL_TEXTURE_2D)
-        
-        # Draw only feature/boundary edges in black
+        glEnableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_vbo)
+        glColorPointer(4, GL_UNSIGNED_BYTE, 0, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_vbo)
+        glDrawElements(GL_TRIANGLES, self.untextured_index_count, GL_UNSIGNED_INT, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_COLOR_ARRAY)
+        
+        # Draw only feature/boundary edges in black, reusing the enabled
+        # vertex array state
         glColor3f(0, 0, 0)
         glLineWidth(3)
-        glBegin(GL_LINES)
-        for v1, v2 in self.feature_edges:
-            glVertex3fv(v1)
-            glVertex3fv(v2)
-        glEnd()
+        glBindBuffer(GL_ARRAY_BUFFER, self.edge_vbo)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glDrawArrays(GL_LINES, 0, self.edge_vertex_count)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
         glPopMatrix()
 
     def check_keybinds(self, event):
@@ -460,25 +629,13 @@ class Render:
                 self.last_mouse_pos = event.pos
                 self.mouse_down_pos = event.pos  # Remember where we pressed
             elif event.button == 3:  # Right click - change color immediately
-                # Ensure OpenGL matrices are up-to-date for ray picking
-                glPushMatrix()
-                self.update_camera()
-                glScalef(self.model_scale_factor, self.model_scale_factor, self.model_scale_factor)
-                glTranslatef(-self.center[0], -self.center[1], -self.center[2])
-                ray_origin, ray_dir = self.get_ray_from_mouse(event.pos)
-                glPopMatrix()
-                triangles = self.model.vectors
-                min_t = float('inf')
-                hit_tri = None
-                for tri_idx, triangle in enumerate(triangles):
-                    t = self.ray_triangle_intersect(ray_origin, ray_dir, triangle)
-                    if t is not None and t < min_t:
-                        min_t = t
-                        hit_tri = tri_idx
+                hit_tri = self.pick_triangle(event.pos)
                 if hit_tri is not None:
-                    surf_idx = self.triangle_to_surface[hit_tri]
+                    surf_idx = int(self.triangle_surface[hit_tri])
                     self.surface_colors[surf_idx] = self.random_color()
                     self.surface_materials[surf_idx] = None  # Remove texture when changing color
+                    self.colors_revision += 1
+                    self.needs_redraw = True
                     print(f"Changed color of surface {surf_idx}")
         elif event.type == pygame.MOUSEBUTTONUP:
             if event.button == 1:
@@ -491,24 +648,12 @@ class Render:
                     
                     # If mouse moved less than 5 pixels, treat as a click
                     if drag_distance < 5:
-                        # Ensure OpenGL matrices are up-to-date for ray picking
-                        glPushMatrix()
-                        self.update_camera()
-                        glScalef(self.model_scale_factor, self.model_scale_factor, self.model_scale_factor)
-                        glTranslatef(-self.center[0], -self.center[1], -self.center[2])
-                        ray_origin, ray_dir = self.get_ray_from_mouse(event.pos)
-                        glPopMatrix()
-                        triangles = self.model.vectors
-                        min_t = float('inf')
-                        hit_tri = None
-                        for tri_idx, triangle in enumerate(triangles):
-                            t = self.ray_triangle_intersect(ray_origin, ray_dir, triangle)
-                            if t is not None and t < min_t:
-                                min_t = t
-                                hit_tri = tri_idx
+                        hit_tri = self.pick_triangle(event.pos)
                         if hit_tri is not None:
-                            surf_idx = self.triangle_to_surface[hit_tri]
+                            surf_idx = int(self.triangle_surface[hit_tri])
                             self.surface_materials[surf_idx] = True  # Apply texture
+                            self.colors_revision += 1
+                            self.needs_redraw = True
                             print(f"Applied texture to surface {surf_idx} (texture_id: {self.texture_id})")
                 
                 self.mouse_down_pos = None  # Reset
@@ -522,19 +667,24 @@ class Render:
                 self.camera_pitch += dy * 0.5
                 self.camera_pitch = max(-89, min(89, self.camera_pitch))
                 self.last_mouse_pos = (x, y)
+                self.needs_redraw = True
         elif event.type == pygame.MOUSEWHEEL:
             if event.y > 0:
                 self.camera_distance = max(self.min_distance, self.camera_distance - 0.1 * self.size)
             else:
                 self.camera_distance = min(self.max_distance, self.camera_distance + 0.1 * self.size)
+            self.needs_redraw = True
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_t:
                 self.transparent_mode = not self.transparent_mode
                 print(f"Transparency mode: {'ON' if self.transparent_mode else 'OFF'}")
+                self.needs_redraw = True
             elif event.key == pygame.K_r:
                 # Reset all surfaces to default
                 self.surface_colors = [self.default_surface_color[:] for _ in self.surfaces]
                 self.surface_materials = [None for _ in self.surfaces]
+                self.colors_revision += 1
+                self.needs_redraw = True
                 print("Reset all surfaces to default")
 
     def draw_scene(self):
@@ -559,6 +709,7 @@ class Render:
         
         # Restore OpenGL state
         glPopAttrib()
+        self.needs_redraw = False
         
     def run(self):
         # The main loop is now controlled by the GUI class
@@ -639,6 +790,7 @@ class Render:
         
         # Update projection clipping planes for the new scale
         self.update_projection()
+        self.needs_redraw = True
         
         print(f"Scale factor set to {factor:.2f}x (model size: {scaled_size:.2f} units)")
     
@@ -647,9 +799,7 @@ class Render:
         Get the real-world dimensions of the model in meters.
         Returns (width, height, depth) tuple.
         """
-        min_ = np.min(self.model.vectors.reshape(-1, 3), axis=0)
-        max_ = np.max(self.model.vectors.reshape(-1, 3), axis=0)
-        dimensions = (max_ - min_) * self.model_scale_factor
+        dimensions = (self.bounds_max - self.bounds_min) * self.model_scale_factor
         return dimensions
     
     def get_real_world_size(self):